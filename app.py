@@ -1,15 +1,22 @@
+import concurrent.futures
+import fractions
 import io
+import json
+import multiprocessing
 import os
 import shutil
 import subprocess
 import tempfile
+from os.path import splitext
 from pathlib import Path
 
+import img2pdf
 import streamlit as st
 from PIL import Image
-from fpdf import FPDF
-from PyPDF2 import PdfMerger
 from pydub import AudioSegment
+from pypdf import PdfWriter
+
+from text_pdf import txt_to_pdf
 
 # ---------------- UI ----------------
 st.set_page_config(page_title="th3 c0ncat3nat0r", page_icon="🔗")
@@ -18,16 +25,28 @@ st.write("Combine multiple media files into a single output.")
 uploaded_files = st.file_uploader("Upload files", accept_multiple_files=True)
 
 # -------------- Helpers -------------
+@st.cache_resource(show_spinner=False)
+def _find_ffmpeg_bins():
+    """Walk $PATH for ffmpeg/ffprobe once per server process, not on every rerun."""
+    return shutil.which("ffmpeg"), shutil.which("ffprobe")
+
+FFMPEG_BIN, FFPROBE_BIN = _find_ffmpeg_bins()
+
 def have_ffmpeg() -> bool:
-    return shutil.which("ffmpeg") is not None
+    return FFMPEG_BIN is not None
 
 def detect_type(files):
     """Detect if uploaded files are documents, audio or video."""
+    # Only name and MIME type matter, and a tuple of those is cheap to hash across reruns
+    return _detect_type_cached(tuple((f.name, f.type) for f in files))
+
+@st.cache_data(show_spinner=False)
+def _detect_type_cached(entries):
     types = set()
-    for f in files:
-        mime = (f.type or '').split('/')
+    for name, mime_type in entries:
+        mime = (mime_type or '').split('/')
         primary = mime[0] if mime else ''
-        ext = Path(f.name).suffix.lower()
+        ext = splitext(name)[1].lower()
         if primary in {"audio", "video", "image"}:
             types.add(primary)
         elif ext in {".pdf", ".txt"}:
@@ -42,128 +61,418 @@ def detect_type(files):
         return "document"
     return "mixed"
 
+def _run(cmd):
+    """Run a subprocess command and raise a readable error if it fails."""
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or "FFmpeg failed")
+    return proc
+
+def _run_to_buffer(cmd, chunk_size: int = 1 << 20) -> io.BytesIO:
+    """Run an ffmpeg command writing to ``pipe:1`` and collect its stdout in memory."""
+    with tempfile.TemporaryFile() as err:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err) as proc:
+            buf = io.BytesIO()
+            try:
+                while chunk := proc.stdout.read(chunk_size):
+                    buf.write(chunk)
+            except BaseException:
+                # e.g. MemoryError or an interrupted rerun: don't leave ffmpeg running
+                proc.kill()
+                raise
+        # Popen.__exit__ has closed stdout and waited for the process
+        if proc.returncode != 0:
+            err.seek(0)
+            raise RuntimeError(err.read().decode("utf-8", "replace").strip() or "FFmpeg failed")
+    buf.seek(0)
+    return buf
+
+def _persist_uploads(files):
+    """Write each upload to a named temp file (keeping its suffix) and return the paths."""
+    paths = []
+    for f in files:
+        f.seek(0)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=splitext(f.name)[1]) as src:
+            shutil.copyfileobj(f, src, 1 << 20)
+        paths.append(src.name)
+    return paths
+
 # -------- Document combine ----------
+# Each spawned worker re-executes this script as __mp_main__ (Streamlit's __main__
+# has a __file__ but no __spec__), so starting one costs ~0.8s; the layout itself
+# runs at ~95k chars/s. Measured figures, used to decide whether a pool pays off.
+TEXT_LAYOUT_CHARS_PER_SEC = 95_000
+TEXT_WORKER_STARTUP_SEC = 0.8
+
+# Size image pages at 72 dpi like Pillow's PDF writer did, whatever DPI the file claims
+IMAGE_PAGE_LAYOUT = img2pdf.get_fixed_dpi_layout_fun((72, 72))
+IMG2PDF_UNSUPPORTED = (
+    img2pdf.AlphaChannelError, img2pdf.ExifOrientationError,
+    img2pdf.ImageOpenError, img2pdf.UnsupportedColorspaceError,
+)
+
+def _render_texts(texts):
+    """Render each text to PDF bytes, in worker processes when there is enough text."""
+    workers = min(len(texts), os.cpu_count() or 1)
+    # Time saved by splitting the layout vs. starting the workers (assumed serialised)
+    saved = sum(map(len, texts)) / TEXT_LAYOUT_CHARS_PER_SEC * (1 - 1 / workers)
+    if workers > 1 and saved > workers * TEXT_WORKER_STARTUP_SEC:
+        # spawn rather than fork: the Streamlit server process is multi-threaded
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(workers) as pool:
+            return pool.map(txt_to_pdf, texts)
+    return [txt_to_pdf(text) for text in texts]
+
 def combine_documents(files):
-    merger = PdfMerger()
-    tmp_files = []
-    for f in files:
-        ext = Path(f.name).suffix.lower()
+    """Merge images, text and PDFs into one PDF, rendering pages in memory."""
+    # Text layout is pure-Python CPU work, so render all .txt uploads up front
+    txt_idx = [i for i, f in enumerate(files) if splitext(f.name)[1].lower() == ".txt"]
+    rendered = _render_texts([files[i].read().decode("utf-8") for i in txt_idx])
+    txt_pdfs = dict(zip(txt_idx, rendered))
+
+    writer = PdfWriter()
+    for i, f in enumerate(files):
+        ext = splitext(f.name)[1].lower()
         if ext in {".png", ".jpg", ".jpeg"}:
-            img = Image.open(f).convert("RGB")
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-            img.save(tmp.name, "PDF")
-            tmp_files.append(tmp)
-            merger.append(tmp.name)
+            try:
+                # Embeds JPEG data as-is and PNG data without decoding pixels
+                page = io.BytesIO(img2pdf.convert(f.read(), rotation=img2pdf.Rotation.ifvalid,
+                                                  layout_fun=IMAGE_PAGE_LAYOUT))
+            except IMG2PDF_UNSUPPORTED:
+                # Alpha, odd colorspaces etc. that img2pdf won't embed; flatten with Pillow as before
+                f.seek(0)
+                page = io.BytesIO()
+                Image.open(f).convert("RGB").save(page, "PDF")
+                page.seek(0)
+            writer.append(page)
         elif ext == ".txt":
-            text = f.read().decode("utf-8")
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            pdf.set_font("helvetica", size=12)  # safer than "Arial"
-            for line in text.splitlines():
-                pdf.multi_cell(0, 10, line)
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-            pdf.output(tmp.name)
-            tmp_files.append(tmp)
-            merger.append(tmp.name)
-        else:  # treat as pdf
-            merger.append(f)
+            writer.append(io.BytesIO(txt_pdfs[i]))
+        else:  # treat as pdf; the reader pulls objects from the upload lazily
+            f.seek(0)
+            writer.append(f)
     output = io.BytesIO()
-    merger.write(output)
-    merger.close()
-    for t in tmp_files:
-        try:
-            t.close()
-            Path(t.name).unlink(missing_ok=True)
-        except Exception:
-            pass
+    writer.write(output)
+    writer.close()
     output.seek(0)
     return output
 
 # ---------- Audio combine -----------
 def combine_audio(files):
-    # Requires system ffmpeg for many formats
-    combined = AudioSegment.silent(duration=0)
+    """
+    Decode every upload with one ffmpeg process, resample to 44.1 kHz stereo,
+    concatenate with the concat filter and stream MP3 straight into memory.
+    """
+    if not have_ffmpeg():
+        return _combine_audio_pydub(files)
+
+    temp_sources = _persist_uploads(files)
+    try:
+        chains = "".join(
+            f"[{i}:a:0]aresample=44100,aformat=channel_layouts=stereo[a{i}];" for i in range(len(temp_sources))
+        )
+        labels = "".join(f"[a{i}]" for i in range(len(temp_sources)))
+        cmd = [FFMPEG_BIN, "-y", "-hide_banner", "-loglevel", "error"]
+        for src in temp_sources:
+            cmd += ["-i", src]
+        cmd += [
+            "-filter_complex", f"{chains}{labels}concat=n={len(temp_sources)}:v=0:a=1[out]",
+            "-map", "[out]",
+            "-c:a", "libmp3lame", "-b:a", "192k",
+            "-f", "mp3", "pipe:1"
+        ]
+        return _run_to_buffer(cmd)
+    finally:
+        for p in temp_sources:
+            Path(p).unlink(missing_ok=True)
+
+def _combine_audio_pydub(files):
+    """Fallback used when no ffmpeg binary is on PATH."""
+    # Collect the raw PCM and join once; `combined += seg` re-copies the whole buffer each time
+    chunks = []
     for f in files:
-        seg = AudioSegment.from_file(f).set_frame_rate(44100).set_channels(2)
-        combined += seg
+        seg = AudioSegment.from_file(f).set_frame_rate(44100).set_channels(2).set_sample_width(2)
+        chunks.append(seg.raw_data)
+    combined = AudioSegment(data=b"".join(chunks), sample_width=2, frame_rate=44100, channels=2)
     output = io.BytesIO()
     combined.export(output, format="mp3", bitrate="192k")
     output.seek(0)
     return output
 
 # ---------- Video combine (FFmpeg) ----------
-def _run(cmd):
-    """Run a subprocess command and raise a readable error if it fails."""
+def _probe(path: str):
+    """
+    Return the first video/audio stream parameters of a file as reported by
+    ffprobe, or None if ffprobe is unavailable or cannot read the file.
+    """
+    if FFPROBE_BIN is None:
+        return None
+    cmd = [
+        FFPROBE_BIN, "-v", "error",
+        "-show_entries",
+        "stream=codec_type,codec_name,profile,level,has_b_frames,width,height,sample_aspect_ratio,"
+        "r_frame_rate,time_base,pix_fmt,sample_rate,channel_layout"
+        ":stream_tags=rotate:stream_side_data=rotation",
+        "-of", "json", path
+    ]
     proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     if proc.returncode != 0:
-        raise RuntimeError(proc.stderr.strip() or "FFmpeg failed")
-    return proc
+        return None
+    info = {"video": None, "audio": None}
+    for stream in json.loads(proc.stdout or "{}").get("streams", []):
+        kind = stream.get("codec_type")
+        if kind in info and info[kind] is None:
+            info[kind] = stream
+    return info
+
+def _fingerprint(info):
+    """
+    Stream parameters that must match across inputs for a stream-copy concat.
+    The demuxer keeps only the first file's SPS/avcC, so the H.264 profile,
+    level and reorder depth must agree as well as the frame geometry, and
+    its display matrix, so rotation must match too. The same goes for the
+    AudioSpecificConfig, so the AAC profile must match as well.
+    """
+    if info is None or info["video"] is None or info["audio"] is None:
+        return None
+    v, a = info["video"], info["audio"]
+    return (
+        v.get("codec_name"), v.get("profile"), v.get("level"), v.get("has_b_frames"),
+        v.get("width"), v.get("height"), _rotation(v), v.get("r_frame_rate"), v.get("time_base"), v.get("pix_fmt"),
+        a.get("codec_name"), a.get("profile"), a.get("sample_rate"), a.get("channel_layout"),
+    )
+
+def _can_stream_copy(infos) -> bool:
+    """True when every probed input is already H.264/AAC yuv420p with identical parameters."""
+    if len({_fingerprint(info) for info in infos}) != 1 or _fingerprint(infos[0]) is None:
+        return False
+    v, a = infos[0]["video"], infos[0]["audio"]
+    return v.get("codec_name") == "h264" and v.get("pix_fmt") == "yuv420p" and a.get("codec_name") == "aac"
+
+def _rotation(video) -> int:
+    """Display rotation in degrees (0/90/180/270) from the display matrix or legacy rotate tag."""
+    for side in video.get("side_data_list") or []:
+        if "rotation" in side:
+            return int(float(side["rotation"])) % 360
+    try:
+        return int((video.get("tags") or {}).get("rotate", 0)) % 360
+    except ValueError:
+        return 0
+
+def _display_size(video):
+    """Frame size after ffmpeg's autorotation, i.e. what the filters actually see."""
+    w, h = video.get("width"), video.get("height")
+    return (h, w) if _rotation(video) % 180 == 90 else (w, h)
+
+def _same_frame_size(infos) -> bool:
+    """True when every input has audio and video with the same displayed size and pixel aspect."""
+    if any(info is None or info["video"] is None or info["audio"] is None for info in infos):
+        return False
+    sizes = {(*_display_size(i["video"]), i["video"].get("sample_aspect_ratio")) for i in infos}
+    return len(sizes) == 1
 
-def _normalize_to_mp4(src_path: str, dst_path: str, width: int = 1280, fps: int = 30):
+_HW_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_videotoolbox")
+# Consumer NVENC cards cap concurrent encode sessions, and one media engine is shared anyway
+HW_MAX_SESSIONS = 2
+
+@st.cache_resource(show_spinner=False)
+def _detect_hw_encoder():
+    """
+    Return the first hardware H.264 encoder that ffmpeg lists *and* can open
+    on this machine, or None. A build may list nvenc/qsv without the device
+    being present, so each candidate gets a one-frame test encode with the
+    same options the normalize step uses (e.g. videotoolbox's -q:v only works
+    on Apple Silicon).
+    """
+    if FFMPEG_BIN is None:
+        return None
+    proc = subprocess.run([FFMPEG_BIN, "-hide_banner", "-encoders"],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    for enc in _HW_ENCODERS:
+        if enc not in proc.stdout:
+            continue
+        probe = subprocess.run([
+            FFMPEG_BIN, "-hide_banner", "-loglevel", "error",
+            *_hwaccel_args(enc), "-f", "lavfi", "-i", "color=size=256x256:rate=1:duration=1",
+            "-frames:v", "1", *_video_codec_args(enc), "-f", "null", "-"
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if probe.returncode == 0:
+            return enc
+    return None
+
+def _hwaccel_args(encoder):
+    """Input options for the given encoder: nvenc also decodes on the GPU."""
+    # Frames come back to system memory for the CPU filters, hence no -hwaccel_output_format
+    return ["-hwaccel", "cuda"] if encoder == "h264_nvenc" else []
+
+def _video_codec_args(encoder):
+    """Output options for the normalize encode on the given encoder (None = libx264)."""
+    if encoder == "h264_nvenc":
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0"]
+    if encoder == "h264_qsv":
+        return ["-c:v", "h264_qsv", "-global_quality", "23", "-preset", "veryfast"]
+    if encoder == "h264_videotoolbox":
+        return ["-c:v", "h264_videotoolbox", "-q:v", "55"]
+    return [
+        "-c:v", "libx264", "-preset", "faster", "-crf", "23",
+        "-tune", "fastdecode", "-x264-params", "rc-lookahead=10:ref=1:bframes=2",
+    ]
+
+def _scale_filter(width: int) -> str:
+    """Cap the width at ``width`` and round both dimensions down to even numbers."""
+    return f"scale='trunc(min({width},iw)/2)*2':'-2'"
+
+def _needed_video_filters(video, width: int, fps: int):
+    """
+    The scale/fps/format steps a stream actually needs to reach the target;
+    identity steps are dropped so they don't run every frame through swscale.
+    Without probe data every step is applied.
+    """
+    if video is None:
+        return [_scale_filter(width), f"fps={fps}", "format=yuv420p"]
+    filters = []
+    # Filters run after autorotation, so judge the scale on the displayed size
+    src_w, src_h = (d or 0 for d in _display_size(video))
+    if src_w > width or src_w % 2 or src_h % 2:  # yuv420p needs even dimensions
+        filters.append(_scale_filter(width))
+    try:
+        src_fps = float(fractions.Fraction(video.get("r_frame_rate") or "0"))
+    except (ValueError, ZeroDivisionError):
+        src_fps = 0.0
+    if abs(src_fps - fps) > 0.1:
+        filters.append(f"fps={fps}")
+    if video.get("pix_fmt") != "yuv420p":
+        filters.append("format=yuv420p")
+    return filters
+
+def _can_copy_audio(infos) -> bool:
+    """
+    True when every input's audio is AAC with the same profile, rate and layout,
+    so the normalized segments can keep it as-is: the final concat stream-copies
+    with the first file's AudioSpecificConfig.
+    """
+    if any(info is None or info["audio"] is None for info in infos):
+        return False
+    configs = {(i["audio"].get("codec_name"), i["audio"].get("profile"),
+                i["audio"].get("sample_rate"), i["audio"].get("channel_layout")) for i in infos}
+    return len(configs) == 1 and next(iter(configs))[0] == "aac"
+
+def _normalize_to_mp4(src_path: str, dst_path: str, width: int = 1280, fps: int = 30, threads: int = 0,
+                      info=None, encoder=None, copy_audio: bool = False):
     """
     Transcode any input to a consistent MP4 (H.264/AAC) so concat works
-    regardless of original codec/resolution/fps.
+    regardless of original codec/resolution/fps. ``threads`` caps the encoder
+    thread count (0 lets ffmpeg decide); ``info`` is the input's ``_probe``
+    result, used to skip filters the video doesn't need; ``encoder`` is a
+    hardware encoder from ``_detect_hw_encoder`` (None = libx264);
+    ``copy_audio`` keeps the audio as-is (see ``_can_copy_audio``).
     """
-    ffmpeg = shutil.which("ffmpeg")
-    vf = f"scale='min({width},iw)':'-2',fps={fps},format=yuv420p"
+    hwaccel = _hwaccel_args(encoder)
+    vf = ",".join(_needed_video_filters(info["video"] if info else None, width, fps))
+    if copy_audio:
+        audio_args = ["-c:a", "copy"]
+    else:
+        audio_args = ["-c:a", "aac", "-b:a", "192k"]
     cmd = [
-        ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
-        "-i", src_path,
-        "-vf", vf,
-        "-c:v", "libx264", "-preset", "veryfast", "-crf", "23",
-        "-c:a", "aac", "-b:a", "192k",
-        "-movflags", "+faststart",
+        FFMPEG_BIN, "-y", "-hide_banner", "-loglevel", "error",
+        *hwaccel, "-i", src_path,
+        # Encode the streams _probe described, not ffmpeg's default picks
+        "-map", "0:v:0", "-map", "0:a:0?",
+        *(["-vf", vf] if vf else []),
+        *_video_codec_args(encoder),
+        *audio_args,
+        "-threads", str(threads),
         dst_path
     ]
     _run(cmd)
 
+def _concat_encode_once(src_paths, width: int = 1280, fps: int = 30, encoder=None) -> io.BytesIO:
+    """
+    Concatenate same-size inputs with the concat filter and encode the result
+    once, instead of encoding every file and then muxing the pieces.
+    """
+    hwaccel = _hwaccel_args(encoder)
+    cmd = [FFMPEG_BIN, "-y", "-hide_banner", "-loglevel", "error"]
+    for src in src_paths:
+        cmd += [*hwaccel, "-i", src]
+    pads = "".join(f"[{i}:v:0][{i}:a:0]" for i in range(len(src_paths)))
+    graph = (
+        f"{pads}concat=n={len(src_paths)}:v=1:a=1[cv][a];"
+        f"[cv]{_scale_filter(width)},fps={fps},format=yuv420p[v]"
+    )
+    cmd += [
+        "-filter_complex", graph,
+        "-map", "[v]", "-map", "[a]",
+        *_video_codec_args(encoder),
+        "-c:a", "aac", "-b:a", "192k",
+        "-f", "mp4", "-movflags", "frag_keyframe+empty_moov+default_base_moof",
+        "pipe:1"
+    ]
+    return _run_to_buffer(cmd)
+
 def combine_video_ffmpeg(files):
     """
     Save uploads -> normalize each to MP4 (H.264/AAC) -> concat demuxer (stream copy).
-    Works for "every kind" by re-encoding to a common format first.
+    Works for "every kind" by re-encoding to a common format first; inputs that
+    already share the same H.264/AAC parameters skip normalization entirely,
+    and inputs that only share a frame size are concatenated and encoded once.
     """
     if not have_ffmpeg():
         raise RuntimeError("ffmpeg not found. Install with: sudo apt-get install -y ffmpeg")
 
     # 1) Persist uploads to disk
-    temp_sources = []
-    for f in files:
-        src = tempfile.NamedTemporaryFile(delete=False, suffix=Path(f.name).suffix)
-        src.write(f.read())
-        src.flush(); src.close()
-        temp_sources.append(src.name)
+    temp_sources = _persist_uploads(files)
 
-    # 2) Normalize each to a common format
+    # 2) Normalize each to a common format, unless they already match
     normalized = []
     try:
-        for src in temp_sources:
-            norm = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-            norm.close()
-            _normalize_to_mp4(src, norm.name, width=1280, fps=30)
-            normalized.append(norm.name)
+        infos = [_probe(src) for src in temp_sources]
+        encoder = _detect_hw_encoder()
+        if _can_stream_copy(infos):
+            parts = temp_sources
+        elif _same_frame_size(infos):
+            return _concat_encode_once(temp_sources, width=1280, fps=30, encoder=encoder)
+        else:
+            # Intermediates are plain files, not named pipes: the MP4 muxer needs a
+            # seekable output, and a FIFO would stall each encoder until the demuxer
+            # reached it, serializing the parallel encodes below. The demuxer reads
+            # them back right after they are written, mostly from the page cache.
+            for _ in temp_sources:
+                norm = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
+                norm.close()
+                normalized.append(norm.name)
+            # Run the encoders side by side, splitting the cores between them; hardware
+            # encoders get a few sessions and -threads doesn't apply to them
+            cpus = os.cpu_count() or 1
+            if encoder is None:
+                workers = min(len(temp_sources), cpus)
+                per_enc_threads = max(1, cpus // workers)
+            else:
+                workers = min(len(temp_sources), HW_MAX_SESSIONS)
+                per_enc_threads = 0
+            copy_audio = _can_copy_audio(infos)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                jobs = [
+                    pool.submit(_normalize_to_mp4, src, dst, width=1280, fps=30, threads=per_enc_threads,
+                                info=info, encoder=encoder, copy_audio=copy_audio)
+                    for src, dst, info in zip(temp_sources, normalized, infos)
+                ]
+                for job in concurrent.futures.as_completed(jobs):
+                    job.result()
+            parts = normalized
 
         # 3) Concat via demuxer (no re-encode)
         listfile = tempfile.NamedTemporaryFile(delete=False, suffix=".txt")
-        listfile.write("\n".join([f"file '{p}'" for p in normalized]).encode("utf-8"))
+        listfile.write("\n".join([f"file '{p}'" for p in parts]).encode("utf-8"))
         listfile.flush(); listfile.close()
 
-        out_tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-        out_tmp.close()
-
-        ffmpeg = shutil.which("ffmpeg")
+        # 4) Stream the result straight into memory as fragmented MP4
         concat_cmd = [
-            ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+            FFMPEG_BIN, "-y", "-hide_banner", "-loglevel", "error",
             "-f", "concat", "-safe", "0", "-i", listfile.name,
-            "-c", "copy", "-movflags", "+faststart",
-            out_tmp.name
+            "-c", "copy", "-f", "mp4", "-movflags", "frag_keyframe+empty_moov+default_base_moof",
+            "pipe:1"
         ]
-        _run(concat_cmd)
-
-        # 4) Return bytes
-        data = io.BytesIO(Path(out_tmp.name).read_bytes())
-        data.seek(0)
-        return data
+        return _run_to_buffer(concat_cmd)
     finally:
         # cleanup
         for p in temp_sources:
@@ -174,10 +483,6 @@ def combine_video_ffmpeg(files):
             Path(listfile.name).unlink(missing_ok=True)  # type: ignore
         except Exception:
             pass
-        try:
-            Path(out_tmp.name).unlink(missing_ok=True)  # type: ignore
-        except Exception:
-            pass
 
 # ----------------- App flow -----------------
 if uploaded_files:
@@ -0,0 +1,18 @@
+"""
+Plain-text -> PDF rendering, kept in its own module so app.py's worker pool
+pickles a plain importable function. Spawned workers still re-execute
+app.py on start-up (see TEXT_WORKER_STARTUP_SEC there).
+"""
+from fpdf import FPDF
+
+
+def txt_to_pdf(text: str) -> bytes:
+    """Lay out ``text`` on A4 pages in 12pt Helvetica and return the PDF bytes."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.set_font("helvetica", size=12)  # safer than "Arial"
+    pdf.c_margin = 0
+    # One call lays out the whole text; normalize line endings as splitlines() did
+    pdf.multi_cell(0, 10, "\n".join(text.splitlines()))
+    return bytes(pdf.output())